@@ -7,8 +7,72 @@ to display for a digital slide rule cursor based on the subsection
 intervals defined in the PostScript engine.
 """
 
+# Performance notes
+# -----------------
+# A cursor lookup is a search over at most ~10 subsection boundaries plus
+# one float format, so each call does only a handful of arithmetic
+# operations. Its cost is interpreter dispatch (attribute and method
+# lookups, dict indexing, temporary iterators), not computation, and
+# there is no bulk data to parallelise. SIMD or GPU work cannot pay off
+# here. The changes that do help are:
+#
+#   - precomputing everything that depends only on the static scale
+#     definition (per-subsection smallest interval and decimal places,
+#     the guarded region table) in __init__;
+#   - keeping that data in flat parallel lists and searching them with
+#     bisect (numpy/numba only for batch queries);
+#   - moving the per-frame path to compiled code, which in this project
+#     is the Swift port (ScaleDefinition.cursorDecimalPlaces in
+#     SlideRuleCoreV3).
+
+import bisect
+import functools
 import math
-from typing import Dict, List, Optional, Any
+from decimal import Decimal
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Any, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy is only needed for batch queries
+    np = None
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is an optional accelerator for batch queries
+    njit = None
+
+
+# printf-style format per decimal-place count (index 0 unused by the
+# calculator). A constant %-spec skips the format-spec parsing that a
+# nested f-string precision does on every call.
+_FORMATS = ('%.0f', '%.1f', '%.2f', '%.3f', '%.4f', '%.5f')
+
+
+if njit is not None:
+    @njit(cache=True, parallel=True)
+    def _batch_decimal_places(lookup, decimals, positions, out):
+        """
+        Compiled batch lookup used by get_decimal_places_batch.
+        
+        lookup/decimals are the calculator's guarded region table, so
+        no separate bounds check is needed.
+        """
+        n = lookup.shape[0]
+        for i in prange(positions.shape[0]):
+            position = positions[i]
+            # Inline bisect_right over the (short) lookup array
+            left = 0
+            right = n
+            while left < right:
+                mid = (left + right) >> 1
+                if position < lookup[mid]:
+                    right = mid
+                else:
+                    left = mid + 1
+            out[i] = decimals[left - 1]
+else:
+    _batch_decimal_places = None
 
 
 class ScalePrecisionCalculator:
@@ -17,6 +81,13 @@ class ScalePrecisionCalculator:
     PostScript scale subsection definitions.
     """
     
+    # Fixed attribute layout: no per-instance __dict__, and attribute
+    # reads on the lookup path are plain slot loads
+    __slots__ = (
+        '_beginscale', '_endscale', '_xfactor', '_rows',
+        '_lookup', '_lookup_decimals', '_lookup_np', '_lookup_decimals_np',
+    )
+    
     def __init__(self, scale_definition: Dict[str, Any]):
         """
         Initialize with a scale definition.
@@ -29,67 +100,196 @@ class ScalePrecisionCalculator:
                 - xfactor: Precision multiplier (optional, default 100)
                 - formula: Scale formula function (optional)
         """
-        self.subsections = scale_definition['subsections']
-        self.beginscale = scale_definition['beginscale']
-        self.endscale = scale_definition['endscale']
-        self.xfactor = scale_definition.get('xfactor', 100)
-        
-        # Sort subsections by beginsub to ensure proper ordering
-        self.subsections.sort(key=lambda s: s['beginsub'])
+        # Copy the subsection dicts into (beginsub, intervals) rows so
+        # later edits to the caller's definition cannot reach this instance
+        rows = tuple(
+            (s['beginsub'], tuple(s['intervals']))
+            for s in scale_definition['subsections']
+        )
+        self._setup(
+            scale_definition['beginscale'],
+            scale_definition['endscale'],
+            scale_definition.get('xfactor', 100),
+            rows,
+        )
     
-    def get_decimal_places(self, position: float) -> int:
+    @classmethod
+    def from_tuples(
+        cls,
+        beginscale: float,
+        endscale: float,
+        xfactor: int,
+        rows: Sequence[Sequence[Any]],
+    ) -> "ScalePrecisionCalculator":
         """
-        Get appropriate decimal places for cursor at given position.
+        Create a calculator from a compact subsection table.
+        
+        The rows are used directly, without building subsection dicts,
+        so an already-sorted tuple table is shared rather than copied.
         
         Args:
-            position: Current cursor position on the scale
+            beginscale: Starting value of scale
+            endscale: Ending value of scale
+            xfactor: Precision multiplier
+            rows: (beginsub, intervals) pairs, where intervals is the
+                (primary, secondary, tertiary, quaternary) tuple
         
         Returns:
-            Number of decimal places to display (1-5)
+            Configured ScalePrecisionCalculator
+        """
+        calculator = cls.__new__(cls)
+        calculator._setup(beginscale, endscale, xfactor, tuple(rows))
+        return calculator
+    
+    def _setup(
+        self,
+        beginscale: float,
+        endscale: float,
+        xfactor: int,
+        rows: Sequence[Sequence[Any]],
+    ) -> None:
         """
-        # Validate position is within scale bounds
-        if position < self.beginscale or position > self.endscale:
-            return 2  # default for out-of-bounds
+        Precompute the lookup tables from (beginsub, intervals) rows.
         
-        # Find the active subsection for this position
-        active_subsection = self._find_active_subsection(position)
+        Args:
+            beginscale: Starting value of scale
+            endscale: Ending value of scale
+            xfactor: Precision multiplier
+            rows: (beginsub, intervals) pairs
+        """
+        self._beginscale = beginscale
+        self._endscale = endscale
+        self._xfactor = xfactor
         
-        if active_subsection is None:
-            return 2  # default if no subsection found
+        # Sort rows by beginsub to ensure proper ordering. Definitions
+        # are normally written in order, so only sort when they are not.
+        if any(rows[i][0] > rows[i + 1][0] for i in range(len(rows) - 1)):
+            rows = tuple(sorted(rows, key=lambda row: row[0]))
+        self._rows = rows
         
-        # Get the smallest interval from this subsection
-        smallest_interval = self._get_smallest_interval(active_subsection)
+        # Subsection start values as a flat list, searched with bisect
+        # when building the region table below
+        beginsubs = [beginsub for beginsub, _ in rows]
         
-        if smallest_interval is None:
-            return 2  # default if no interval found
+        # Smallest interval and decimal places for each subsection. These
+        # depend only on the static subsection intervals, so compute them
+        # once here rather than on every cursor move. Subsections with no
+        # intervals defined fall back to the default of 2.
+        smallest = [
+            self._get_smallest_interval(intervals) for _, intervals in rows
+        ]
+        decimals = [
+            2 if interval is None else self._interval_to_decimal_places(interval)
+            for interval in smallest
+        ]
         
-        # Convert interval to decimal places
-        return self._interval_to_decimal_places(smallest_interval)
+        # Region table for get_decimal_places: position falls in region
+        # bisect_right(_lookup, position) - 1, whose decimal places are in
+        # _lookup_decimals. Guard regions below beginscale, before the
+        # first subsection and above endscale all map to the default of 2,
+        # so the bounds check costs nothing extra per call.
+        self._lookup = [-math.inf]
+        self._lookup_decimals = [2]
+        starts = [self.beginscale] + [
+            b for b in beginsubs if self.beginscale < b <= self.endscale
+        ]
+        for start in starts:
+            if start == self._lookup[-1]:
+                continue  # duplicate beginsub
+            idx = bisect.bisect_right(beginsubs, start) - 1
+            self._lookup.append(start)
+            self._lookup_decimals.append(decimals[idx] if idx >= 0 else 2)
+        self._lookup.append(math.nextafter(self.endscale, math.inf))
+        self._lookup_decimals.append(2)
+        
+        # Array copies for batch queries. Values are 1-5, so int8 is plenty.
+        if np is not None:
+            self._lookup_np = np.asarray(self._lookup, dtype=np.float64)
+            self._lookup_decimals_np = np.asarray(self._lookup_decimals, dtype=np.int8)
+    
+    @property
+    def beginscale(self) -> float:
+        """Starting value of scale (read-only)."""
+        return self._beginscale
+    
+    @property
+    def endscale(self) -> float:
+        """Ending value of scale (read-only)."""
+        return self._endscale
+    
+    @property
+    def xfactor(self) -> int:
+        """Precision multiplier (read-only)."""
+        return self._xfactor
     
-    def _find_active_subsection(self, position: float) -> Optional[Dict]:
+    @property
+    def subsections(self) -> Tuple[Mapping[str, Any], ...]:
         """
-        Find which subsection applies to the given position.
+        Subsection definitions sorted by beginsub.
+        
+        Built from the stored rows on each access; lookups never use it.
+        The view is read-only, since factory calculators are shared and
+        the precomputed tables could not follow an edit anyway.
+        
+        Returns:
+            Tuple of read-only {'beginsub', 'intervals'} mappings, with
+            intervals as a tuple
+        """
+        return tuple(
+            MappingProxyType({'beginsub': beginsub, 'intervals': tuple(intervals)})
+            for beginsub, intervals in self._rows
+        )
+    
+    def get_decimal_places(self, position: float) -> int:
+        """
+        Get appropriate decimal places for cursor at given position.
         
         Args:
-            position: Position on the scale
+            position: Current cursor position on the scale
+        
+        Returns:
+            Number of decimal places to display (1-5)
+        """
+        # Out-of-bounds positions and positions before the first
+        # subsection land in guard regions that return the default of 2
+        return self._lookup_decimals[bisect.bisect_right(self._lookup, position) - 1]
+    
+    def get_decimal_places_batch(self, positions: Sequence[float]) -> "np.ndarray | List[int]":
+        """
+        Get decimal places for many cursor positions at once.
+        
+        Equivalent to calling get_decimal_places for each position, but
+        uses a single vectorized search when numpy is available (e.g. for
+        labelling every tick across a scale), or a compiled loop when
+        numba is also installed.
+        
+        Args:
+            positions: Cursor positions on the scale
         
         Returns:
-            Active subsection dict, or None if not found
+            Decimal places per position: an int8 ndarray shaped like
+            positions if numpy is installed (0-d for a scalar position),
+            otherwise a list
         """
-        active_subsection = None
-        
-        # Iterate through subsections to find the last one 
-        # whose beginsub is <= position
-        for subsection in self.subsections:
-            if position >= subsection['beginsub']:
-                active_subsection = subsection
-            else:
-                # Since sorted, we can stop here
-                break
-        
-        return active_subsection
+        if np is None:
+            return [self.get_decimal_places(p) for p in positions]
+        
+        positions = np.asarray(positions, dtype=np.float64)
+        
+        if _batch_decimal_places is not None:
+            out = np.empty(positions.shape, dtype=np.int8)
+            _batch_decimal_places(
+                self._lookup_np, self._lookup_decimals_np,
+                positions.ravel(), out.ravel(),
+            )
+            return out
+        
+        idx = np.searchsorted(self._lookup_np, positions, side='right') - 1
+        # Indexing with a 0-d idx yields an np.int8 scalar; keep it an array
+        # so both numpy backends return the same type
+        return np.asarray(self._lookup_decimals_np[idx], dtype=np.int8)
     
-    def _get_smallest_interval(self, subsection: Dict) -> Optional[float]:
+    def _get_smallest_interval(self, intervals: Sequence[Optional[float]]) -> Optional[float]:
         """
         Extract the smallest (finest) interval from a subsection.
         
@@ -97,13 +297,11 @@ class ScalePrecisionCalculator:
         We want the smallest non-null value (typically quaternary).
         
         Args:
-            subsection: Subsection dictionary
+            intervals: The subsection's interval row
         
         Returns:
             Smallest interval value, or None if all are null
         """
-        intervals = subsection['intervals']
-        
         # Scan backwards through intervals to find last non-null
         for interval in reversed(intervals):
             if interval is not None:
@@ -127,7 +325,15 @@ class ScalePrecisionCalculator:
         
         Returns:
             Number of decimal places (1-5)
+        
+        Raises:
+            ValueError: If the interval is zero, negative or NaN
         """
+        # Reject bad tick spacings (typos in a scale definition) instead of
+        # deriving a precision from them; written so NaN fails too
+        if not interval > 0:
+            raise ValueError(f"tick interval must be positive, got {interval!r}")
+        
         if interval >= 1:
             # Integer precision, but show one decimal for smooth interpolation
             return 1
@@ -135,15 +341,20 @@ class ScalePrecisionCalculator:
         # Calculate how many decimal places needed to represent this interval
         # For 0.01, we need 2 decimal places
         # For 0.001, we need 3 decimal places
-        # Formula: -floor(log10(interval))
-        decimal_places = -math.floor(math.log10(interval))
+        # Formula: -floor(log10(interval)), i.e. minus the exponent of the
+        # leading digit. Decimal reads that exponent from the interval's
+        # shortest repr exactly, avoiding log10 rounding near powers of 10.
+        # float() first so numpy scalars, Fractions etc. repr as plain
+        # numbers.
+        decimal_places = -Decimal(repr(float(interval))).adjusted()
         
         # Add one more decimal place for interpolation
         # (users can estimate about 1/10 between marks)
         decimal_places += 1
         
-        # Clamp to reasonable range (1-5)
-        return min(max(decimal_places, 1), 5)
+        # Clamp to reasonable range (1-5) with a conditional expression
+        # rather than two min/max calls
+        return 1 if decimal_places < 1 else 5 if decimal_places > 5 else decimal_places
     
     def get_formatted_value(self, position: float) -> str:
         """
@@ -156,10 +367,50 @@ class ScalePrecisionCalculator:
         Returns:
             Formatted string (e.g., "1.234" or "56.7")
         """
-        decimal_places = self.get_decimal_places(position)
-        return f"{position:.{decimal_places}f}"
+        return _FORMATS[self.get_decimal_places(position)] % position
+
 
+# Subsection tables as (beginsub, intervals) rows, sorted by beginsub.
+# Kept as module-level tuples so they are built once at import.
+#
+# Calculators keep their definition as immutable rows and expose it only
+# through read-only properties (beginscale, endscale, xfactor and the
+# subsections view), so no caller can change what another sees. Each factory below therefore builds its calculator once
+# and returns the same shared instance on every call.
 
+# PostScript definition lines 430-461
+_C_SCALE_SUBSECTIONS = (
+    (1,  (1, 0.1, 0.05, 0.01)),
+    (2,  (1, 0.5, 0.1, 0.02)),
+    (4,  (1, 0.5, 0.1, 0.05)),
+    (10, (10, 1, 0.5, 0.1)),
+    (20, (10, 5, 1, 0.2)),
+    (40, (10, 5, 1, 0.5)),
+)
+
+# PostScript definition lines 1201-1210
+_LL00_SCALE_SUBSECTIONS = (
+    (0.990, (0.001, 0.0005, 0.0001, 0.00005)),
+    (0.995, (0.001, 0.0005, 0.0001, 0.00002)),
+    (0.998, (0.0005, 0.0001, 0.00005, 0.00001)),
+)
+
+# PostScript definition lines 710-728
+_K_SCALE_SUBSECTIONS = (
+    (1,    (1, 0.5, 0.1, 0.05)),
+    (3,    (1, None, 0.5, 0.1)),
+    (6,    (1, None, None, 0.2)),
+    (10,   (10, 5, 1, 0.5)),
+    (30,   (10, None, 5, 1)),
+    (60,   (10, None, None, 2)),
+    (100,  (100, 50, 10, 5)),
+    (300,  (100, None, 50, 10)),
+    (600,  (100, None, None, 20)),
+    (1000, (1000, 500, 100, 50)),
+)
+
+
+@functools.lru_cache(maxsize=None)
 def create_c_scale_calculator() -> ScalePrecisionCalculator:
     """
     Create a calculator for the standard C scale.
@@ -167,24 +418,12 @@ def create_c_scale_calculator() -> ScalePrecisionCalculator:
     This matches the PostScript definition from lines 430-461.
     
     Returns:
-        Configured ScalePrecisionCalculator
+        Shared, configured ScalePrecisionCalculator
     """
-    c_scale_definition = {
-        'beginscale': 1,
-        'endscale': 10,
-        'xfactor': 100,
-        'subsections': [
-            {'beginsub': 1,  'intervals': [1, 0.1, 0.05, 0.01]},
-            {'beginsub': 2,  'intervals': [1, 0.5, 0.1, 0.02]},
-            {'beginsub': 4,  'intervals': [1, 0.5, 0.1, 0.05]},
-            {'beginsub': 10, 'intervals': [10, 1, 0.5, 0.1]},
-            {'beginsub': 20, 'intervals': [10, 5, 1, 0.2]},
-            {'beginsub': 40, 'intervals': [10, 5, 1, 0.5]},
-        ]
-    }
-    return ScalePrecisionCalculator(c_scale_definition)
+    return ScalePrecisionCalculator.from_tuples(1, 10, 100, _C_SCALE_SUBSECTIONS)
 
 
+@functools.lru_cache(maxsize=None)
 def create_ll00_scale_calculator() -> ScalePrecisionCalculator:
     """
     Create a calculator for the LL00 scale (very fine precision).
@@ -192,21 +431,14 @@ def create_ll00_scale_calculator() -> ScalePrecisionCalculator:
     This matches the PostScript definition from lines 1201-1210.
     
     Returns:
-        Configured ScalePrecisionCalculator
+        Shared, configured ScalePrecisionCalculator
     """
-    ll00_scale_definition = {
-        'beginscale': 0.990,
-        'endscale': 0.999,
-        'xfactor': 100000,
-        'subsections': [
-            {'beginsub': 0.990, 'intervals': [0.001, 0.0005, 0.0001, 0.00005]},
-            {'beginsub': 0.995, 'intervals': [0.001, 0.0005, 0.0001, 0.00002]},
-            {'beginsub': 0.998, 'intervals': [0.0005, 0.0001, 0.00005, 0.00001]},
-        ]
-    }
-    return ScalePrecisionCalculator(ll00_scale_definition)
+    return ScalePrecisionCalculator.from_tuples(
+        0.990, 0.999, 100000, _LL00_SCALE_SUBSECTIONS
+    )
 
 
+@functools.lru_cache(maxsize=None)
 def create_k_scale_calculator() -> ScalePrecisionCalculator:
     """
     Create a calculator for the K scale (cube roots).
@@ -214,26 +446,9 @@ def create_k_scale_calculator() -> ScalePrecisionCalculator:
     This matches the PostScript definition from lines 710-728.
     
     Returns:
-        Configured ScalePrecisionCalculator
+        Shared, configured ScalePrecisionCalculator
     """
-    k_scale_definition = {
-        'beginscale': 1,
-        'endscale': 1000,
-        'xfactor': 100,
-        'subsections': [
-            {'beginsub': 1,    'intervals': [1, 0.5, 0.1, 0.05]},
-            {'beginsub': 3,    'intervals': [1, None, 0.5, 0.1]},
-            {'beginsub': 6,    'intervals': [1, None, None, 0.2]},
-            {'beginsub': 10,   'intervals': [10, 5, 1, 0.5]},
-            {'beginsub': 30,   'intervals': [10, None, 5, 1]},
-            {'beginsub': 60,   'intervals': [10, None, None, 2]},
-            {'beginsub': 100,  'intervals': [100, 50, 10, 5]},
-            {'beginsub': 300,  'intervals': [100, None, 50, 10]},
-            {'beginsub': 600,  'intervals': [100, None, None, 20]},
-            {'beginsub': 1000, 'intervals': [1000, 500, 100, 50]},
-        ]
-    }
-    return ScalePrecisionCalculator(k_scale_definition)
+    return ScalePrecisionCalculator.from_tuples(1, 1000, 100, _K_SCALE_SUBSECTIONS)
 
 
 # Demo and testing
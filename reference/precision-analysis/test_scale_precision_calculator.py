@@ -0,0 +1,201 @@
+"""
+Tests for the slide rule cursor precision calculator.
+
+Run from this directory with: python -m unittest
+"""
+
+import math
+import random
+import unittest
+from fractions import Fraction
+from unittest import mock
+
+import scale_precision_calculator as spc
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+FACTORIES = (
+    spc.create_c_scale_calculator,
+    spc.create_ll00_scale_calculator,
+    spc.create_k_scale_calculator,
+)
+
+
+def sample_positions(calc, count=2000):
+    """Boundary, non-finite and random positions in and around a calculator's scale."""
+    lo, hi = calc.beginscale, calc.endscale
+    span = hi - lo
+    positions = [
+        lo, hi, lo - 1, hi + 1,
+        math.nextafter(lo, -math.inf), math.nextafter(hi, math.inf),
+        -math.inf, math.inf, math.nan,
+    ]
+    positions += [s['beginsub'] for s in calc.subsections]
+    rng = random.Random(1234)
+    positions += [rng.uniform(lo - 0.1 * span, hi + 0.1 * span) for _ in range(count)]
+    return positions
+
+
+def single_subsection_calculator(intervals):
+    """Calculator for a 1-10 scale with one subsection of the given intervals."""
+    return spc.ScalePrecisionCalculator({
+        'beginscale': 1,
+        'endscale': 10,
+        'subsections': [{'beginsub': 1, 'intervals': intervals}],
+    })
+
+
+class IntervalToDecimalPlacesTests(unittest.TestCase):
+    
+    def test_standard_intervals(self):
+        calc = spc.create_c_scale_calculator()
+        expected = {
+            10: 1, 1: 1, 0.5: 2, 0.25: 2, 0.1: 2, 0.05: 3, 0.02: 3,
+            0.01: 3, 0.005: 4, 0.001: 4, 0.0001: 5, 0.00001: 5,
+        }
+        for interval, decimals in expected.items():
+            with self.subTest(interval=interval):
+                self.assertEqual(calc._interval_to_decimal_places(interval), decimals)
+    
+    def test_fraction_intervals(self):
+        calc = single_subsection_calculator([1, Fraction(1, 10), Fraction(1, 20), Fraction(1, 100)])
+        self.assertEqual(calc.get_decimal_places(5.0), 3)
+    
+    def test_invalid_intervals_raise(self):
+        for interval in (0, 0.0, -0.1, math.nan):
+            with self.subTest(interval=interval):
+                with self.assertRaises(ValueError):
+                    single_subsection_calculator([1, 0.1, 0.05, interval])
+    
+    @unittest.skipIf(np is None, "numpy not installed")
+    def test_numpy_scalar_intervals(self):
+        calc = single_subsection_calculator(list(np.array([1, 0.1, 0.05, 0.01])))
+        self.assertEqual(calc.get_decimal_places(5.0), 3)
+
+
+
+class GetDecimalPlacesTests(unittest.TestCase):
+    
+    def test_known_positions(self):
+        cases = {
+            spc.create_c_scale_calculator: {1.0: 3, 3.14159: 3, 9.0: 3, 10.0: 2},
+            spc.create_ll00_scale_calculator: {0.990: 5, 0.9985: 5, 0.999: 5},
+            spc.create_k_scale_calculator: {1: 3, 5: 2, 50: 1, 1000: 1},
+        }
+        for factory, expected in cases.items():
+            calc = factory()
+            for position, decimals in expected.items():
+                with self.subTest(scale=factory.__name__, position=position):
+                    self.assertEqual(calc.get_decimal_places(position), decimals)
+    
+    def test_out_of_range_and_nan_use_default(self):
+        for factory in FACTORIES:
+            calc = factory()
+            positions = (
+                calc.beginscale - 1,
+                math.nextafter(calc.endscale, math.inf),
+                -math.inf, math.inf, math.nan,
+            )
+            for position in positions:
+                with self.subTest(scale=factory.__name__, position=position):
+                    self.assertEqual(calc.get_decimal_places(position), 2)
+
+
+class SharedFactoryCalculatorTests(unittest.TestCase):
+    
+    def test_factories_return_shared_instances(self):
+        for factory in FACTORIES:
+            with self.subTest(scale=factory.__name__):
+                self.assertIs(factory(), factory())
+    
+    def test_shared_subsections_are_read_only(self):
+        calc = spc.create_c_scale_calculator()
+        subsections = calc.subsections
+        with self.assertRaises(TypeError):
+            subsections[0]['beginsub'] = 5
+        with self.assertRaises(TypeError):
+            subsections[0]['intervals'][3] = 0.5
+        with self.assertRaises(AttributeError):
+            subsections.append({'beginsub': 50, 'intervals': (10, 5, 1, 0.5)})
+        self.assertEqual(spc.create_c_scale_calculator().subsections, subsections)
+    
+    def test_shared_scale_bounds_are_read_only(self):
+        calc = spc.create_c_scale_calculator()
+        for name in ('beginscale', 'endscale', 'xfactor'):
+            with self.subTest(attribute=name):
+                with self.assertRaises(AttributeError):
+                    setattr(calc, name, 5)
+        self.assertEqual(spc.create_c_scale_calculator().beginscale, 1)
+        self.assertEqual(spc.create_c_scale_calculator().endscale, 10)
+        self.assertEqual(spc.create_c_scale_calculator().xfactor, 100)
+    
+    def test_caller_definition_edits_do_not_leak(self):
+        definition = {
+            'beginscale': 1,
+            'endscale': 10,
+            'subsections': [{'beginsub': 1, 'intervals': [1, 0.1, 0.05, 0.01]}],
+        }
+        calc = spc.ScalePrecisionCalculator(definition)
+        definition['subsections'][0]['intervals'][3] = 0.5
+        definition['subsections'].append({'beginsub': 5, 'intervals': [1, None, None, None]})
+        self.assertEqual(calc.get_decimal_places(6.0), 3)
+        self.assertEqual(len(calc.subsections), 1)
+        self.assertEqual(calc.subsections[0]['intervals'], (1, 0.1, 0.05, 0.01))
+
+
+class BatchDecimalPlacesTests(unittest.TestCase):
+    """get_decimal_places_batch must agree with get_decimal_places on every backend."""
+    
+    def assert_batch_matches_scalar(self, calc, positions, result):
+        expected = [calc.get_decimal_places(p) for p in positions]
+        self.assertEqual([int(d) for d in result], expected)
+    
+    def check_array_backend(self):
+        for factory in FACTORIES:
+            calc = factory()
+            positions = sample_positions(calc)
+            with self.subTest(scale=factory.__name__):
+                result = calc.get_decimal_places_batch(positions)
+                self.assertEqual(result.dtype, np.int8)
+                self.assert_batch_matches_scalar(calc, positions, result)
+                
+                # 2-D input keeps its shape, including non-contiguous views
+                grid = np.asarray(positions[:2000], dtype=np.float64).reshape(40, 50)
+                for array in (grid, grid.T):
+                    result = calc.get_decimal_places_batch(array)
+                    self.assertEqual(result.shape, array.shape)
+                    self.assert_batch_matches_scalar(calc, array.ravel(), result.ravel())
+                
+                # A scalar position gives a 0-d array on every numpy backend
+                result = calc.get_decimal_places_batch(5.5)
+                self.assertIsInstance(result, np.ndarray)
+                self.assertEqual(result.shape, ())
+                self.assertEqual(result.dtype, np.int8)
+                self.assertEqual(int(result), calc.get_decimal_places(5.5))
+    
+    def test_pure_python_fallback(self):
+        with mock.patch.object(spc, 'np', None):
+            for factory in FACTORIES:
+                calc = factory()
+                positions = sample_positions(calc)
+                with self.subTest(scale=factory.__name__):
+                    result = calc.get_decimal_places_batch(positions)
+                    self.assertIsInstance(result, list)
+                    self.assert_batch_matches_scalar(calc, positions, result)
+    
+    @unittest.skipIf(np is None, "numpy not installed")
+    def test_numpy_backend(self):
+        with mock.patch.object(spc, '_batch_decimal_places', None):
+            self.check_array_backend()
+    
+    @unittest.skipIf(spc._batch_decimal_places is None, "numba not installed")
+    def test_numba_backend(self):
+        self.check_array_backend()
+
+
+if __name__ == '__main__':
+    unittest.main()